@@ -1,5 +1,11 @@
+from array import array
+
 from mmu import MMU
 
+#per-frame flag bits
+REFERENCED = 1
+DIRTY = 2
+
 
 class ClockMMU(MMU):
     def __init__(self, frames):
@@ -7,142 +13,186 @@ class ClockMMU(MMU):
         if frames < 1:
             raise ValueError("Frame number must be at least 1")
         self.frames_capacity = frames
-        self.frames = [None] * self.frames_capacity #list of dicts: {page_number, reference_bit, dirty_bit}
+        #per-frame state kept as parallel arrays indexed by frame number
+        self.page_of = array('l', [-1]) * self.frames_capacity #page loaded in each frame, -1 = free
+        self.flags = bytearray(self.frames_capacity) #REFERENCED/DIRTY bits per frame
         self.hand = 0 #pointer for clock algorithm. Poiting to the next frame to check
-        
-        #Hand = index that scans frames 
+
+        #Hand = index that scans frames
         #Victim = frame under the hand when its reference bit is 0
-        
+
         self.page_to_index = {} #fast lookup for page_number
-        
+
         #number of used frames (<= capacity)
         self.used = 0
-        
+
         #counters
         self.page_faults = 0
         self.disk_reads = 0
         self.disk_writes = 0
-        
+
         #debug mode
-        self.debug = False
+        self.reset_debug()
 
     def set_debug(self):
         # TODO: Implement the method to set debug mode
         self.debug = True
+        #route accesses through the verbose versions
+        self.read_memory = self._read_memory_debug
+        self.write_memory = self._write_memory_debug
 
     def reset_debug(self):
         # TODO: Implement the method to reset debug mode
         self.debug = False
+        #route accesses through the print-free fast versions
+        if self.frames_capacity == 1:
+            self.read_memory = self._read_single_frame
+            self.write_memory = self._write_single_frame
+        else:
+            self.read_memory = self._read_memory_fast
+            self.write_memory = self._write_memory_fast
+
+    def _sweep(self):
+        #advance the hand past referenced frames, clearing their bits, and
+        #return the victim frame (ref bit == 0); the hand is left on the
+        #frame after the victim. Hot state lives in locals during the sweep.
+        flags = self.flags
+        capacity = self.frames_capacity
+        hand = self.hand
+        debug = self.debug
+        while flags[hand] & REFERENCED:
+            flags[hand] &= ~REFERENCED
+            if debug:
+                print(f"Frame {hand} reference bit set to 0, moving hand")
+            hand += 1
+            if hand == capacity:
+                hand = 0
+        self.hand = hand + 1 if hand + 1 < capacity else 0
+        return hand
 
     def read_memory(self, page_number):
         # TODO: Implement the method to read memory
-        #HIT 
-        for i, frame in enumerate(self.frames):
-            if frame is not None and frame['page_number'] == page_number:
-                frame['reference_bit'] = 1
-                if self.debug:
-                    print(f"Read hit: page {page_number} found in frame {i}")
-                return
-        #MISS
+        #rebound per instance by set_debug()/reset_debug()
+        self._read_memory_fast(page_number)
+
+    def write_memory(self, page_number):
+        self._write_memory_fast(page_number)
+
+    def _read_memory_fast(self, page_number):
+        #hits are handled inline, misses go through the shared _fault_fast
+        idx = self.page_to_index.get(page_number)
+        if idx is not None:
+            self.flags[idx] |= REFERENCED
+            return
+        self._fault_fast(page_number, False)
+
+    def _write_memory_fast(self, page_number):
+        idx = self.page_to_index.get(page_number)
+        if idx is not None:
+            self.flags[idx] = REFERENCED | DIRTY
+            return
+        self._fault_fast(page_number, True)
+
+    def _fault_fast(self, page_number, is_write):
+        #same as the miss half of _access_debug without any debug checks or prints
+        flags = REFERENCED | DIRTY if is_write else REFERENCED
         self.page_faults += 1
         self.disk_reads += 1
-        if self.debug:
-            print(f"Read miss: page {page_number} not found, page fault #{self.page_faults}")
-            
-        #check for free frame
         if self.used < self.frames_capacity:
-            for idx in range(self.frames_capacity):
-                if self.frames[idx] is None:
-                    self.frames[idx] = {'page_number': page_number, 'reference_bit': 1, 'dirty_bit': 0}
-                    self.page_to_index[page_number] = idx
-                    self.used += 1
-                    if self.debug:
-                        print(f"Loaded page {page_number} into free frame {idx}")
-                    return
-        #eviction 
-        while True:
-            current_frame = self.frames[self.hand]
-            if current_frame['reference_bit'] == 1:
-                current_frame['reference_bit'] = 0
-                if self.debug:
-                    print(f"Frame {self.hand} reference bit set to 0, moving hand")
-                self.hand = (self.hand + 1) % self.frames_capacity
-                continue
-                
-            #if ref bit == 0 --> evict
-            victim_frame = self.hand
-            victim = self.frames[victim_frame]
-            if victim['dirty_bit'] == 1:
+            idx = self.used
+            self.page_of[idx] = page_number
+            self.flags[idx] = flags
+            self.page_to_index[page_number] = idx
+            self.used += 1
+            return
+        victim_frame = self._sweep()
+        if self.flags[victim_frame] & DIRTY:
+            self.disk_writes += 1
+        del self.page_to_index[self.page_of[victim_frame]]
+        self.page_of[victim_frame] = page_number
+        self.flags[victim_frame] = flags
+        self.page_to_index[page_number] = victim_frame
+
+    #with a single frame the clock always comes straight back to frame 0,
+    #so every miss evicts whatever is there and the hand never moves
+    def _read_single_frame(self, page_number):
+        if self.page_of[0] == page_number:
+            self.flags[0] |= REFERENCED
+            return
+        self._fault_single_frame(page_number, REFERENCED)
+
+    def _write_single_frame(self, page_number):
+        if self.page_of[0] == page_number:
+            self.flags[0] = REFERENCED | DIRTY
+            return
+        self._fault_single_frame(page_number, REFERENCED | DIRTY)
+
+    def _fault_single_frame(self, page_number, flags):
+        self.page_faults += 1
+        self.disk_reads += 1
+        if self.used:
+            if self.flags[0] & DIRTY:
                 self.disk_writes += 1
-                if self.debug:
-                    print(f"Evicting dirty page {victim['page_number']} from frame {victim_frame}, writing to disk")
-            else:
-                if self.debug:
-                    print(f"Evicting clean page {victim['page_number']} from frame {victim_frame}")
-                    
-            #replace with new page
-            self.frames[victim_frame] = {'page_number': page_number, 'reference_bit': 1, 'dirty_bit': 0}
-            
-            #move to the next frame after eviction
-            self.hand = (self.hand + 1) % self.frames_capacity
-            if self.debug:
-                print(f"Loaded page {page_number} into frame {victim_frame}")
-            break
+            del self.page_to_index[self.page_of[0]]
+        else:
+            self.used = 1
+        self.page_of[0] = page_number
+        self.flags[0] = flags
+        self.page_to_index[page_number] = 0
 
-    def write_memory(self, page_number):
-        #HIT similar to read_memory but set dirty bit
-        for i, frame in enumerate(self.frames):
-            if frame is not None and frame['page_number'] == page_number:
-                frame['reference_bit'] = 1
-                frame['dirty_bit'] = 1
-                if self.debug:
-                    print(f"Write hit: page {page_number} found in frame {i}, marked dirty")
-                return
+    def _read_memory_debug(self, page_number):
+        self._access_debug(page_number, False)
+
+    def _write_memory_debug(self, page_number):
+        self._access_debug(page_number, True)
+
+    def _access_debug(self, page_number, is_write):
+        #read and write only differ in the access name, setting the dirty bit
+        #and the ", marked dirty" note on the messages
+        access = "Write" if is_write else "Read"
+        marked = ", marked dirty" if is_write else ""
+        #HIT
+        idx = self.page_to_index.get(page_number)
+        if idx is not None:
+            self.flags[idx] |= REFERENCED | DIRTY if is_write else REFERENCED
+            if self.debug:
+                print(f"{access} hit: page {page_number} found in frame {idx}{marked}")
+            return
         #MISS
         self.page_faults += 1
         self.disk_reads += 1
         if self.debug:
-            print(f"Write miss: page {page_number} not found, page fault #{self.page_faults}")
-            
-        #check for free frame
+            print(f"{access} miss: page {page_number} not found, page fault #{self.page_faults}")
+
+        #check for free frame (frames are never freed, so they fill up in order)
         if self.used < self.frames_capacity:
-            for idx in range(self.frames_capacity):
-                if self.frames[idx] is None:
-                    self.frames[idx] = {'page_number': page_number, 'reference_bit': 1, 'dirty_bit': 1}
-                    self.page_to_index[page_number] = idx
-                    self.used += 1
-                    if self.debug:
-                        print(f"Loaded page {page_number} into free frame {idx}, marked dirty")
-                    return
+            idx = self.used
+            self.page_of[idx] = page_number
+            self.flags[idx] = REFERENCED | DIRTY if is_write else REFERENCED
+            self.page_to_index[page_number] = idx
+            self.used += 1
+            if self.debug:
+                print(f"Loaded page {page_number} into free frame {idx}{marked}")
+            return
         #eviction using clock algorithm
-        while True:
-            current_frame = self.frames[self.hand]
-            if current_frame['reference_bit'] == 1:
-                current_frame['reference_bit'] = 0
-                if self.debug:
-                    print(f"Frame {self.hand} reference bit set to 0, moving hand")
-                self.hand = (self.hand + 1) % self.frames_capacity
-                continue
-                
-            #if ref bit == 0 --> evict
-            victim_frame = self.hand
-            victim = self.frames[victim_frame]
-            if victim['dirty_bit'] == 1:
-                self.disk_writes += 1
-                if self.debug:
-                    print(f"Evicting dirty page {victim['page_number']} from frame {victim_frame}, writing to disk")
-            else:
-                if self.debug:
-                    print(f"Evicting clean page {victim['page_number']} from frame {victim_frame}")
-                    
-            #replace with new page, mark dirty
-            self.frames[victim_frame] = {'page_number': page_number, 'reference_bit': 1, 'dirty_bit': 1}
-            
-            #move to the next frame after eviction
-            self.hand = (self.hand + 1) % self.frames_capacity
+        victim_frame = self._sweep()
+        victim_page = self.page_of[victim_frame]
+        if self.flags[victim_frame] & DIRTY:
+            self.disk_writes += 1
             if self.debug:
-                print(f"Loaded page {page_number} into frame {victim_frame}, marked dirty")
-            break
+                print(f"Evicting dirty page {victim_page} from frame {victim_frame}, writing to disk")
+        else:
+            if self.debug:
+                print(f"Evicting clean page {victim_page} from frame {victim_frame}")
+
+        #replace with new page (dirty if this is a write)
+        del self.page_to_index[victim_page]
+        self.page_of[victim_frame] = page_number
+        self.flags[victim_frame] = REFERENCED | DIRTY if is_write else REFERENCED
+        self.page_to_index[page_number] = victim_frame
+
+        if self.debug:
+            print(f"Loaded page {page_number} into frame {victim_frame}{marked}")
 
     def get_total_disk_reads(self):
         # TODO: Implement the method to get total disk reads
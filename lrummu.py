@@ -1,10 +1,11 @@
+from collections import OrderedDict
+
 from mmu import MMU
 
 class LruMMU(MMU):
     def __init__(self, frames):
         # TODO: Constructor logic for LruMMU
         self.num_frames = frames
-        self.debug_mode = False
         
         # Stat counters
         self.disk_reads = 0
@@ -13,93 +14,85 @@ class LruMMU(MMU):
         self.page_table = {}
         self.frame_table = [None] * frames
         self.dirty_pages = {}
-        self.lru_list = []
-        self.occupied_frames = set()
+        self.lru_list = OrderedDict()  # front = MRU, back = LRU
+        self.free_frames = list(range(frames - 1, -1, -1))  # stack, frame 0 on top
+        self.reset_debug()
 
     def set_debug(self):
         # TODO: Implement the method to set debug mode
         self.debug_mode = True
+        # Route accesses through the verbose versions
+        self.read_memory = self._read_memory_debug
+        self.write_memory = self._write_memory_debug
 
     def reset_debug(self):
          # TODO: Implement the method to reset debug mode
         self.debug_mode = False
+        # Route accesses through the print-free fast versions
+        self.read_memory = self._read_memory_fast
+        self.write_memory = self._write_memory_fast
 
     def read_memory(self, page_number):
         # TODO: Implement the method to read memory
-        if self.debug_mode:
-            print(f"READ: Page {page_number}")
-        
-        if page_number in self.page_table:
-            # Page hit - update LRU order
-            if page_number in self.lru_list:
-                self.lru_list.remove(page_number)
-            self.lru_list.insert(0, page_number)
-            
-            if self.debug_mode:
-                print(f"  HIT: Page {page_number} in frame {self.page_table[page_number]}")
-        else:
-            # Page fault
-            self.page_faults += 1
-            if self.debug_mode:
-                print(f"  PAGE FAULT: Page {page_number}")
-            
-            # Find frame to use
-            frame_num = None
-            for i in range(self.num_frames):
-                if i not in self.occupied_frames:
-                    frame_num = i
-                    break
-            
-            if frame_num is None:
-                # Evict LRU page
-                victim_page = self.lru_list[-1]  # Last is LRU
-                frame_num = self.page_table[victim_page]
-                
-                # Write to disk if dirty
-                if victim_page in self.dirty_pages and self.dirty_pages[victim_page]:
-                    self.disk_writes += 1
-                    if self.debug_mode:
-                        print(f"  DISK WRITE: Page {victim_page}")
-                
-                # Remove victim page
-                del self.page_table[victim_page]
-                self.frame_table[frame_num] = None
-                self.occupied_frames.remove(frame_num)
-                self.lru_list.remove(victim_page)
-                
-                if self.debug_mode:
-                    print(f"  EVICT: Page {victim_page} from frame {frame_num}")
-            
-            # Load new page
-            self.disk_reads += 1
-            if self.debug_mode:
-                print(f"  DISK READ: Page {page_number}")
-            
-            self.page_table[page_number] = frame_num
-            self.frame_table[frame_num] = page_number
-            self.occupied_frames.add(frame_num)
-            self.dirty_pages[page_number] = False
-            
-            # Update LRU
-            self.lru_list.insert(0, page_number)
-            
-            if self.debug_mode:
-                print(f"  LOAD: Page {page_number} into frame {frame_num}")
+        # Rebound per instance by set_debug()/reset_debug()
+        self._read_memory_fast(page_number)
 
     def write_memory(self, page_number):
-        # TODO: Implement the method to write memory
-        if self.debug_mode:
-            print(f"WRITE: Page {page_number}")
-        
+        self._write_memory_fast(page_number)
+
+    def _read_memory_fast(self, page_number):
+        # Same as _access_debug without any debug checks or prints
+        if page_number in self.page_table:
+            self.lru_list.move_to_end(page_number, last=False)
+            return
+        self._fault_fast(page_number, False)
+
+    def _write_memory_fast(self, page_number):
         if page_number in self.page_table:
-            # Page hit - mark and update LRU
             self.dirty_pages[page_number] = True
-            if page_number in self.lru_list:
-                self.lru_list.remove(page_number)
-            self.lru_list.insert(0, page_number)
+            self.lru_list.move_to_end(page_number, last=False)
+            return
+        self._fault_fast(page_number, True)
+
+    def _fault_fast(self, page_number, is_write):
+        # Page fault path shared by the fast read/write versions
+        self.page_faults += 1
+
+        frame_num = self.free_frames.pop() if self.free_frames else None
+
+        if frame_num is None:
+            victim_page, _ = self.lru_list.popitem(last=True)
+            frame_num = self.page_table.pop(victim_page)
+            if self.dirty_pages.pop(victim_page, False):
+                self.disk_writes += 1
+
+        self.disk_reads += 1
+        self.page_table[page_number] = frame_num
+        self.frame_table[frame_num] = page_number
+        self.dirty_pages[page_number] = is_write
+        self.lru_list[page_number] = None
+        self.lru_list.move_to_end(page_number, last=False)
+
+    def _read_memory_debug(self, page_number):
+        self._access_debug(page_number, False)
+
+    def _write_memory_debug(self, page_number):
+        self._access_debug(page_number, True)
+
+    def _access_debug(self, page_number, is_write):
+        if self.debug_mode:
+            print(f"{'WRITE' if is_write else 'READ'}: Page {page_number}")
+        
+        frame_num = self.page_table.get(page_number, -1)
+        if frame_num >= 0:
+            # Page hit - mark if written and update LRU
+            if is_write:
+                self.dirty_pages[page_number] = True
+            self.lru_list.move_to_end(page_number, last=False)
             
             if self.debug_mode:
-                print(f"  HIT: Page {page_number} in frame {self.page_table[page_number]} (marked dirty)")
+                marked = " (marked dirty)" if is_write else ""
+                print(f"  HIT: Page {page_number} in frame {frame_num}{marked}")
         else:
             # Page fault
             self.page_faults += 1
@@ -107,28 +100,20 @@ class LruMMU(MMU):
                 print(f"  PAGE FAULT: Page {page_number}")
             
             # Find frame to use
-            frame_num = None
-            for i in range(self.num_frames):
-                if i not in self.occupied_frames:
-                    frame_num = i
-                    break
+            frame_num = self.free_frames.pop() if self.free_frames else None
             
             if frame_num is None:
                 # Evict LRU page
-                victim_page = self.lru_list[-1]  # Last is LRU
-                frame_num = self.page_table[victim_page]
+                victim_page, _ = self.lru_list.popitem(last=True)  # Last is LRU
                 
-                # Write to disk if dirty
-                if victim_page in self.dirty_pages and self.dirty_pages[victim_page]:
+                # Remove victim page, writing it to disk if dirty
+                frame_num = self.page_table.pop(victim_page)
+                if self.dirty_pages.pop(victim_page, False):
                     self.disk_writes += 1
                     if self.debug_mode:
                         print(f"  DISK WRITE: Page {victim_page}")
                 
-                # Remove victim page
-                del self.page_table[victim_page]
                 self.frame_table[frame_num] = None
-                self.occupied_frames.remove(frame_num)
-                self.lru_list.remove(victim_page)
                 
                 if self.debug_mode:
                     print(f"  EVICT: Page {victim_page} from frame {frame_num}")
@@ -140,11 +125,11 @@ class LruMMU(MMU):
             
             self.page_table[page_number] = frame_num
             self.frame_table[frame_num] = page_number
-            self.occupied_frames.add(frame_num)
-            self.dirty_pages[page_number] = True
+            self.dirty_pages[page_number] = is_write
             
             # Update LRU
-            self.lru_list.insert(0, page_number)
+            self.lru_list[page_number] = None
+            self.lru_list.move_to_end(page_number, last=False)
             
             if self.debug_mode:
                 print(f"  LOAD: Page {page_number} into frame {frame_num}")
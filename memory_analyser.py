@@ -1,10 +1,70 @@
-import subprocess
+import matplotlib
+matplotlib.use('Agg')  # graphs are only written to PNG, no GUI backend needed
 import matplotlib.pyplot as plt
 import numpy as np
+import csv
+import hashlib
+import json
 import os
 import sys
+from bisect import insort
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
 
+from memsim import simulate
+
+# Results of previous simulation runs, keyed on the trace's real path and
+# mtime plus frames and algorithm, so edited traces are re-simulated. The
+# file records the CACHE_VERSION it was written with and is discarded when
+# that no longer matches, so simulator changes are re-simulated too.
+CACHE_FILE = 'memsim_cache.json'
+
+# The simulator's own sources, hashed into CACHE_VERSION
+SIMULATOR_SOURCES = ['memsim.py', 'mmu.py', 'clockmmu.py', 'lrummu.py', 'randmmu.py']
+
+# Every result from collect_data, written out as it arrives
+RESULTS_FILE = 'simulation_results.csv'
+RESULTS_FIELDS = ['trace', 'algorithm', 'frames', 'fault_rate', 'disk_reads', 'disk_writes']
+
+
+def _first_below(values, threshold):
+    """Index of the first value below threshold, or None if there is none"""
+    below = np.asarray(values) < threshold
+    if not below.size:
+        return None
+    idx = int(np.argmax(below))
+    return idx if below[idx] else None
+
+
+def _simulator_version():
+    """Hash of the simulator sources, stored with the cache"""
+    digest = hashlib.md5()
+    here = Path(__file__).resolve().parent
+    for name in SIMULATOR_SOURCES:
+        digest.update((here / name).read_bytes())
+    return digest.hexdigest()
+
+
+CACHE_VERSION = _simulator_version()
+
+
+def _simulate(trace_file, frames, algorithm, debug_mode='quiet'):
+    """Run the memory simulator in-process and return its results, or None on error"""
+    if frames < 1:
+        # memsim.py silently produces no results for these either
+        return None
+    try:
+        return simulate(trace_file, frames, algorithm, debug_mode)
+    except Exception as e:
+        print(f"Error running simulation: {e}")
+        return None
+
+
+def _one_run(trace_file, frames, algorithm):
+    """Run a single simulation; module-level so pool workers can pickle it"""
+    return _simulate(trace_file, frames, algorithm)
+
+
 class MemoryAnalyser:
     def __init__(self):
         self.traces = ['bzip', 'gcc', 'sixpack', 'swim']
@@ -12,42 +72,80 @@ class MemoryAnalyser:
         self.algorithm_names = {'clock': 'Clock', 'lru': 'LRU', 'rand': 'Random'}
         self.colors = {'clock': '#1f77b4', 'lru': '#ff7f0e', 'rand': '#2ca02c'}
         self.markers = {'clock': 'o', 'lru': 's', 'rand': '^'}
+        self._cache = None
         
     def run_simulation(self, trace_file, frames, algorithm, debug_mode='quiet'):
-        """Run the memory simulator and parse results"""
-        try:
-            cmd = ['python', 'memsim.py', trace_file, str(frames), algorithm, debug_mode]
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
-            
-            if result.returncode != 0:
-                print(f"Error running simulation: {result.stderr}")
-                return None
-                
-            # Parse output
-            lines = result.stdout.strip().split('\n')
-            results = {}
-            
-            for line in lines:
-                if 'total memory frames:' in line:
-                    results['frames'] = int(line.split(':')[1].strip())
-                elif 'events in trace:' in line:
-                    results['events'] = int(line.split(':')[1].strip())
-                elif 'total disk reads:' in line:
-                    results['disk_reads'] = int(line.split(':')[1].strip())
-                elif 'total disk writes:' in line:
-                    results['disk_writes'] = int(line.split(':')[1].strip())
-                elif 'page fault rate:' in line:
-                    results['fault_rate'] = float(line.split(':')[1].strip())
-                    
-            return results
-            
-        except subprocess.TimeoutExpired:
-            print(f"Simulation timed out for {trace_file} with {frames} frames")
-            return None
-        except Exception as e:
-            print(f"Error running simulation: {e}")
-            return None
+        """Run the memory simulator and return its results, reusing a cached result if there is one"""
+        cache = self._get_cache()
+        key = self._cache_key(trace_file, frames, algorithm)
+        # a debug run is wanted for its trace output, so it always simulates
+        if debug_mode == 'quiet' and key in cache:
+            return cache[key]
+
+        results = self._run_memsim(trace_file, frames, algorithm, debug_mode)
+        if results:
+            cache[key] = results
+            self._save_cache()
+        return results
+
+    def _run_memsim(self, trace_file, frames, algorithm, debug_mode='quiet'):
+        """Run the memory simulator in-process and return its results"""
+        return _simulate(trace_file, frames, algorithm, debug_mode)
     
+    def _cache_key(self, trace_file, frames, algorithm):
+        key = f"{os.path.realpath(trace_file)}|{os.path.getmtime(trace_file)}|{frames}|{algorithm}"
+        return hashlib.md5(key.encode()).hexdigest()
+
+    def _get_cache(self):
+        """Load the on-disk cache once per analyser and keep it in memory"""
+        if self._cache is None:
+            self._cache = {}
+            try:
+                with open(CACHE_FILE, 'r') as f:
+                    saved = json.load(f)
+            except (FileNotFoundError, json.JSONDecodeError):
+                saved = None
+            # results from another simulator version are dropped wholesale
+            if isinstance(saved, dict) and saved.get('version') == CACHE_VERSION:
+                self._cache = saved.get('results', {})
+        return self._cache
+
+    def _save_cache(self):
+        with open(CACHE_FILE, 'w') as f:
+            json.dump({'version': CACHE_VERSION, 'results': self._cache}, f)
+
+    def run_simulations(self, jobs, show_progress=False):
+        """Run (trace_file, frames, algorithm) jobs in parallel, reusing cached results"""
+        return dict(self.iter_simulations(jobs, show_progress))
+
+    def iter_simulations(self, jobs, show_progress=False):
+        """Yield (job, result) pairs as each job finishes, cached results first"""
+        cache = self._get_cache()
+        pending = []
+        done = 0
+        for job in jobs:
+            key = self._cache_key(*job)
+            if key in cache:
+                done += 1
+                yield job, cache[key]
+            else:
+                pending.append(job)
+
+        if pending:
+            with ProcessPoolExecutor(max_workers=os.cpu_count()) as pool:
+                futures = {pool.submit(_one_run, *job): job for job in pending}
+                for future in as_completed(futures):
+                    job = futures[future]
+                    result = future.result()
+                    if result:
+                        cache[self._cache_key(*job)] = result
+                    done += 1
+                    if show_progress:
+                        trace_file, frames, algorithm = job
+                        print(f"  Progress: {done}/{len(jobs)} - {trace_file} {algorithm} {frames} frames", end='\r')
+                    yield job, result
+            self._save_cache()
+
     def find_optimal_frame_ranges(self):
         """Find appropriate frame ranges for each trace by testing with a wide range"""
         print("Finding optimal frame ranges for each trace...")
@@ -56,9 +154,14 @@ class MemoryAnalyser:
         # Test with a wide range to find the "knee" of the curve
         test_frames = [1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024, 2048, 4096, 8192]
         
+        # Use LRU as reference algorithm for finding ranges
+        available = [trace for trace in self.traces if os.path.exists(f"{trace}.trace")]
+        results = self.run_simulations([(f"{trace}.trace", frames, 'lru')
+                                        for trace in available for frames in test_frames])
+        
         for trace in self.traces:
             trace_file = f"{trace}.trace"
-            if not os.path.exists(trace_file):
+            if trace not in available:
                 print(f"Warning: {trace_file} not found, using default range")
                 frame_ranges[trace] = list(range(1, 101, 5))
                 continue
@@ -67,9 +170,8 @@ class MemoryAnalyser:
             fault_rates = []
             valid_frames = []
             
-            # Use LRU as reference algorithm for finding ranges
             for frames in test_frames:
-                result = self.run_simulation(trace_file, frames, 'lru')
+                result = results[(trace_file, frames, 'lru')]
                 if result:
                     fault_rates.append(result['fault_rate'])
                     valid_frames.append(frames)
@@ -80,10 +182,9 @@ class MemoryAnalyser:
             
             # Find where fault rate drops significantly (working set size)
             working_set_size = valid_frames[0]  # Start with minimum
-            for i in range(1, len(fault_rates)):
-                if fault_rates[i] < 0.1:  # Less than 10% fault rate
-                    working_set_size = valid_frames[i]
-                    break
+            i = _first_below(fault_rates[1:], 0.1)  # Less than 10% fault rate
+            if i is not None:
+                working_set_size = valid_frames[i + 1]
             
             # Create a range from low memory (stress) to high memory (comfortable)
             min_frames = max(1, valid_frames[0])
@@ -99,14 +200,14 @@ class MemoryAnalyser:
                 
             frame_range = list(range(min_frames, max_frames + 1, step))
             
-            # Add some specific points of interest
+            # Add some specific points of interest, keeping the range sorted
             if working_set_size not in frame_range:
-                frame_range.append(working_set_size)
+                insort(frame_range, working_set_size)
             if working_set_size // 2 not in frame_range:
-                frame_range.append(working_set_size // 2)
+                insort(frame_range, working_set_size // 2)
                 
-            frame_ranges[trace] = sorted(frame_range)
-            print(f"    Range for {trace}: {min(frame_range)} to {max(frame_range)} frames (working set ~{working_set_size})")
+            frame_ranges[trace] = frame_range
+            print(f"    Range for {trace}: {frame_range[0]} to {frame_range[-1]} frames (working set ~{working_set_size})")
             
         return frame_ranges
     
@@ -117,10 +218,26 @@ class MemoryAnalyser:
         
         data = {}
         total_runs = sum(len(frame_ranges[trace]) * len(self.algorithms) for trace in self.traces)
-        current_run = 0
         
         print(f"Collecting data for {total_runs} simulation runs...")
         
+        jobs = [(f"{trace}.trace", frames, algorithm)
+                for trace in self.traces if os.path.exists(f"{trace}.trace")
+                for algorithm in self.algorithms
+                for frames in frame_ranges[trace]]
+        
+        # Stream each result to RESULTS_FILE as soon as its run finishes
+        results = {}
+        with open(RESULTS_FILE, 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=RESULTS_FIELDS)
+            writer.writeheader()
+            for (trace_file, frames, algorithm), result in self.iter_simulations(jobs, show_progress=True):
+                results[(trace_file, frames, algorithm)] = result
+                if result:
+                    writer.writerow({'trace': Path(trace_file).stem, 'algorithm': algorithm, 'frames': frames,
+                                     'fault_rate': result['fault_rate'], 'disk_reads': result['disk_reads'],
+                                     'disk_writes': result['disk_writes']})
+        
         for trace in self.traces:
             trace_file = f"{trace}.trace"
             if not os.path.exists(trace_file):
@@ -139,10 +256,7 @@ class MemoryAnalyser:
                 }
                 
                 for frames in frame_ranges[trace]:
-                    current_run += 1
-                    print(f"  Progress: {current_run}/{total_runs} - {trace} {algorithm} {frames} frames", end='\r')
-                    
-                    result = self.run_simulation(trace_file, frames, algorithm)
+                    result = results[(trace_file, frames, algorithm)]
                     if result:
                         data[trace][algorithm]['frames'].append(frames)
                         data[trace][algorithm]['fault_rates'].append(result['fault_rate'])
@@ -193,17 +307,16 @@ class MemoryAnalyser:
                         if alg in data[trace]:
                             frames_list = data[trace][alg]['frames']
                             fault_list = data[trace][alg]['fault_rates']
-                            for j, fault_rate in enumerate(fault_list):
-                                if fault_rate < 0.1 and j < len(frames_list):
-                                    ax.axvline(x=frames_list[j], color='red', linestyle='--', alpha=0.5)
-                                    ax.text(frames_list[j], 0.5, f'~{frames_list[j]} frames\n(working set)', 
-                                           rotation=90, verticalalignment='center', fontsize=8)
-                                    break
+                            j = _first_below(fault_list, 0.1)
+                            if j is not None and j < len(frames_list):
+                                ax.axvline(x=frames_list[j], color='red', linestyle='--', alpha=0.5)
+                                ax.text(frames_list[j], 0.5, f'~{frames_list[j]} frames\n(working set)', 
+                                       rotation=90, verticalalignment='center', fontsize=8)
                             break
         
         plt.tight_layout()
         plt.savefig('individual_trace_performance.png', dpi=300, bbox_inches='tight')
-        plt.show()
+        plt.close(fig)
     
     def create_comparison_graph(self, data):
         """Create a comparison graph showing all traces for one metric"""
@@ -271,10 +384,9 @@ class MemoryAnalyser:
                 frames_list = data[trace]['lru']['frames']
                 fault_list = data[trace]['lru']['fault_rates']
                 working_set = frames_list[-1]  # Default to max
-                for j, fault_rate in enumerate(fault_list):
-                    if fault_rate < 0.1:
-                        working_set = frames_list[j]
-                        break
+                j = _first_below(fault_list, 0.1)
+                if j is not None:
+                    working_set = frames_list[j]
                 working_sets.append(working_set)
                 trace_names.append(trace.upper())
         
@@ -292,7 +404,7 @@ class MemoryAnalyser:
         
         plt.tight_layout()
         plt.savefig('comparison_analysis.png', dpi=300, bbox_inches='tight')
-        plt.show()
+        plt.close(fig)
     
     def create_summary_table(self, data):
         """Create a summary table of key metrics"""
@@ -318,11 +430,9 @@ class MemoryAnalyser:
                     fault_list = data[trace][algorithm]['fault_rates']
                     
                     # Find working set
-                    for j, fault_rate in enumerate(fault_list):
-                        if fault_rate < 0.1:
-                            if working_set == "Unknown":
-                                working_set = f"~{frames_list[j]} frames"
-                            break
+                    j = _first_below(fault_list, 0.1)
+                    if j is not None and working_set == "Unknown":
+                        working_set = f"~{frames_list[j]} frames"
                     
                     # Find best algorithm at low memory
                     if len(fault_list) > 0 and fault_list[0] < min_fault_rate:
@@ -380,6 +490,7 @@ class MemoryAnalyser:
         print("Generated files:")
         print("  - individual_trace_performance.png")
         print("  - comparison_analysis.png")
+        print(f"  - {RESULTS_FILE}")
 
 # Usage example
 if __name__ == "__main__":
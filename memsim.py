@@ -4,35 +4,23 @@ from randmmu import RandMMU
 
 import sys
 
+PAGE_OFFSET = 12  # page is 2^12 = 4KB
 
-def main():
-    PAGE_OFFSET = 12  # page is 2^12 = 4KB
+USAGE = "Usage: python memsim.py inputfile numberframes replacementmode debugmode"
 
-    ############################
-    # Check input parameters   #
-    ############################
 
-    if (len(sys.argv) < 5):
-        print("Usage: python memsim.py inputfile numberframes replacementmode debugmode")
-        return
+def simulate(trace_file, frames, replacement_mode, debug_mode='quiet'):
+    """Run trace_file through an MMU and return its results as a dict.
 
-    input_file = sys.argv[1]
+    Raises FileNotFoundError if the trace does not exist and ValueError for
+    an invalid frame count or mode, or a badly formatted trace line.
+    """
+    with open(trace_file, 'r') as file:
+        # Read the trace file contents
+        trace_contents = file.readlines()
 
-    try:
-        with open(input_file, 'r') as file:
-            # Read the trace file contents
-            trace_contents = file.readlines()
-    except FileNotFoundError:
-        print(f"Input '{input_file}' could not be found")
-        print("Usage: python memsim.py inputfile numberframes replacementmode debugmode")
-        return
-
-    frames = int(sys.argv[2])
     if frames < 1:
-    #    printf( "Frame number must be at least 1\n");
-       return
-
-    replacement_mode = sys.argv[3]
+        raise ValueError("Frame number must be at least 1")
 
     # Setup MMU based on replacement mode
     if replacement_mode == "rand":
@@ -42,10 +30,7 @@ def main():
     elif replacement_mode == "clock":
         mmu = ClockMMU(frames)
     else:
-        print("Invalid replacement mode. Valid options are [rand, lru, esc]")
-        return
-
-    debug_mode  = sys.argv[4]
+        raise ValueError("Invalid replacement mode. Valid options are [rand, lru, clock]")
 
     # Set debug mode
     if debug_mode == "debug":
@@ -53,42 +38,95 @@ def main():
     elif debug_mode == "quiet":
         mmu.reset_debug()
     else:
-        print("Invalid debug mode. Valid options are [debug, quiet]")
-        return
+        raise ValueError("Invalid debug mode. Valid options are [debug, quiet]")
 
     ############################################################
     # Main Loop: Process the addresses from the trace file     #
     ############################################################
 
-    no_events = 0
+    # Decode the trace up front, then replay it through the MMU in a single
+    # run_trace() call instead of one Python-level dispatch per event.
+    pages = []
+    writes = []
+    bad_line = None
+
+    for trace_line in trace_contents:
+        trace_cmd = trace_line.strip().split(" ")
+        try:
+            page_number = int(trace_cmd[0], 16) >> PAGE_OFFSET
+            op = trace_cmd[1]
+        except (ValueError, IndexError):
+            # unreadable address or missing operation
+            bad_line = len(pages) + 1
+            break
+
+        # Record read or write
+        if op == "R":
+            writes.append(False)
+        elif op == "W":
+            writes.append(True)
+        else:
+            bad_line = len(pages) + 1
+            break
+        pages.append(page_number)
+
+    # Events before a bad line are still processed, as they were when the
+    # trace was replayed line by line
+    mmu.run_trace(pages, writes)
+    if bad_line is not None:
+        raise ValueError(f"Badly formatted file. Error on line {bad_line}")
+
+    no_events = len(pages)
+
+    # fault_rate is rounded to the 4 places the CLI prints, which is what
+    # callers parsing memsim's output have always seen
+    return {
+        'frames': frames,
+        'events': no_events,
+        'disk_reads': mmu.get_total_disk_reads(),
+        'disk_writes': mmu.get_total_disk_writes(),
+        'fault_rate': round(mmu.get_total_page_faults() / no_events, 4),
+    }
 
 
-    with open(input_file, 'r') as trace_file:
-        for trace_line in trace_file:
-            trace_cmd = trace_line.strip().split(" ")
-            logical_address = int(trace_cmd[0], 16)
-            page_number = logical_address >>  PAGE_OFFSET
+def main():
+    ############################
+    # Check input parameters   #
+    ############################
 
+    if (len(sys.argv) < 5):
+        print(USAGE)
+        return
 
-            # Process read or write
-            if trace_cmd[1] == "R":
-                mmu.read_memory(page_number)
-            elif trace_cmd[1] == "W":
-                mmu.write_memory(page_number)
-            else:
-                print(f"Badly formatted file. Error on line {no_events + 1}")
-                return
+    input_file = sys.argv[1]
 
-            no_events += 1
+    # Check the trace exists before validating the other arguments
+    try:
+        with open(input_file, 'r'):
+            pass
+    except FileNotFoundError:
+        print(f"Input '{input_file}' could not be found")
+        print(USAGE)
+        return
+
+    frames = int(sys.argv[2])
+    if frames < 1:
+    #    printf( "Frame number must be at least 1\n");
+       return
+
+    try:
+        results = simulate(input_file, frames, sys.argv[3], sys.argv[4])
+    except ValueError as e:
+        print(e)
+        return
 
     # TODO: Print results
-    print(f"total memory frames: {frames}")
-    print(f"events in trace: {no_events}")
-    print(f"total disk reads: {mmu.get_total_disk_reads()}")
-    print(f"total disk writes: {mmu.get_total_disk_writes()}")
-    print(f"page fault rate: {mmu.get_total_page_faults() / no_events:.4f}")
+    print(f"total memory frames: {results['frames']}")
+    print(f"events in trace: {results['events']}")
+    print(f"total disk reads: {results['disk_reads']}")
+    print(f"total disk writes: {results['disk_writes']}")
+    print(f"page fault rate: {results['fault_rate']:.4f}")
 
 
 if __name__ == "__main__":
     main()
-                    
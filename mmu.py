@@ -8,12 +8,25 @@
 *
 '''
 class MMU:
+    __slots__ = ()
+
     def read_memory(self, page_number):
         pass
 
     def write_memory(self, page_number):
         pass
 
+    def run_trace(self, pages, writes):
+        # Replay a whole decoded trace in one call; writes[i] is true when
+        # pages[i] is written. Subclasses may override with a tighter loop.
+        read_memory = self.read_memory
+        write_memory = self.write_memory
+        for page_number, is_write in zip(pages, writes):
+            if is_write:
+                write_memory(page_number)
+            else:
+                read_memory(page_number)
+
     def set_debug(self):
         pass
 
@@ -1,76 +1,188 @@
 import random
+from array import array
+
 from mmu import MMU
 
+# Victim frames are drawn from a pre-generated block of this many random
+# frame numbers, refilled when it runs out
+RAND_POOL_SIZE = 65536
+
+# Debug messages, %-formatted only when debug output is on
+_FMT_HIT = "hit: page (%d). frame = %d"
+_FMT_WRITE_HIT = "WRITE HIT: page %d in frame %d"
+_FMT_LOAD = "fault: load %d into frame %d"
+_FMT_WRITE_LOAD = "WRITE FAULT: loaded page %d into free frame %d"
+_FMT_REPLACE = "read fault: replaced %d with %d in frame %d"
+_FMT_WRITE_REPLACE = "WRITE FAULT: replaced page %d with %d in frame %d"
+
 class RandMMU(MMU):
+    # read_memory/write_memory are slots because set_debug()/reset_debug()
+    # bind them per instance
+    __slots__ = ('num_frames', 'page_of', 'dirty', 'used', '_rand_pool', '_rand_idx', 'ptable',
+                 'disk_reads', 'disk_writes', 'page_faults', 'debug',
+                 'read_memory', 'write_memory')
+
     def __init__(self, frames):
         self.num_frames = frames
-        self.frames = {} 
+        # per-frame state kept as parallel arrays indexed by frame number
+        self.page_of = array('l', [-1]) * frames  # page held by each frame, -1 = free
+        self.dirty = bytearray(frames)  # 1 once the page in the frame is written
+        self.used = 0
+        self._rand_pool = []  # filled on the first eviction
+        self._rand_idx = 0
         self.ptable = {} 
         self.disk_reads = 0
         self.disk_writes = 0
         self.page_faults = 0
-        self.debug = False
+        self.reset_debug()
 
     def set_debug(self):
         self.debug = True
+        # route accesses through the verbose versions
+        self.read_memory = self._read_memory_debug
+        self.write_memory = self._write_memory_debug
 
     def reset_debug(self):
         self.debug = False
+        # route accesses through the print-free fast versions
+        self.read_memory = self._read_memory_fast
+        self.write_memory = self._write_memory_fast
 
-    def read_memory(self, page_number):
-        if page_number in self.ptable:
-            if self.debug == True:
-                print(f"hit: page ({page_number}). frame = {self.ptable[page_number]}")
-            return  # hit
-        else:
-            # Page fault
-            self.page_faults += 1
-            self.disk_reads += 1
-            if len(self.frames) < self.num_frames:
-                # Free frame available
-                frame_index = len(self.frames)
-                self.frames[frame_index] = page_number
-                self.ptable[page_number] = frame_index
-                if self.debug:
-                    print(f"fault: load {page_number} into frame {frame_index}")
+    def _refill_rand_pool(self):
+        self._rand_pool = random.choices(range(self.num_frames), k=RAND_POOL_SIZE)
+        self._rand_idx = 0
+
+    def _next_victim(self):
+        if self._rand_idx == len(self._rand_pool):
+            self._refill_rand_pool()
+        sheep = self._rand_pool[self._rand_idx]
+        self._rand_idx += 1
+        return sheep
+
+    def run_trace(self, pages, writes):
+        # batched replay with all state in locals; counters are written
+        # back once at the end. Debug runs go through the per-access path.
+        if self.debug:
+            super().run_trace(pages, writes)
+            return
+        ptable = self.ptable
+        page_of = self.page_of
+        dirty = self.dirty
+        n = self.num_frames
+        rand_pool = self._rand_pool
+        rand_idx = self._rand_idx
+        used = self.used
+        faults = 0
+        disk_writes = 0
+        for page_number, is_write in zip(pages, writes):
+            if page_number in ptable:
+                if is_write:
+                    dirty[ptable[page_number]] = 1
+                continue
+            faults += 1
+            if used < n:
+                frame = used
+                used += 1
             else:
-                #find a frame to become sacrificial object
-                sheep = random.choice(list(self.frames.keys()))
-                sheepage = self.frames[sheep]
+                if rand_idx == len(rand_pool):
+                    self._refill_rand_pool()
+                    rand_pool = self._rand_pool
+                    rand_idx = 0
+                frame = rand_pool[rand_idx]
+                rand_idx += 1
+                if dirty[frame]:
+                    disk_writes += 1
+                del ptable[page_of[frame]]
+            page_of[frame] = page_number
+            dirty[frame] = 1 if is_write else 0
+            ptable[page_number] = frame
+        self.used = used
+        self._rand_idx = rand_idx
+        self.page_faults += faults
+        self.disk_reads += faults
+        self.disk_writes += disk_writes
 
+    def _read_memory_fast(self, page_number):
+        if page_number not in self.ptable:
+            self._fault_fast(page_number, False)
 
-                self.frames[sheep] = page_number
-                self.ptable.pop(sheepage)
-                self.ptable[page_number] = sheep
+    def _write_memory_fast(self, page_number):
+        frame = self.ptable.get(page_number)
+        if frame is None:
+            self._fault_fast(page_number, True)
+        else:
+            self.dirty[frame] = 1
+
+    def _fault_fast(self, page_number, is_write):
+        # same as _fault_debug without any debug checks or prints
+        ptable = self.ptable
+        page_of = self.page_of
+        self.page_faults += 1
+        self.disk_reads += 1
+        used = self.used
+        if used < self.num_frames:
+            frame = used
+            self.used = used + 1
+        else:
+            frame = self._next_victim()
+            if self.dirty[frame]:
+                self.disk_writes += 1
+            del ptable[page_of[frame]]
+        page_of[frame] = page_number
+        self.dirty[frame] = 1 if is_write else 0
+        ptable[page_number] = frame
 
-                if self.debug == True:
-                    print(f"read fault: replaced {sheepage} with {page_number} in frame {sheep}")
+    def _read_memory_debug(self, page_number):
+        frame = self.ptable.get(page_number)
+        if frame is None:
+            self._fault_debug(page_number, False)
+        elif self.debug:
+            print(_FMT_HIT % (page_number, frame))
 
-    def write_memory(self, page_number):
-        if page_number in self.ptable:
-            if self.debug == True:
-                print(f"WRITE HIT: page {page_number} in frame {self.ptable[page_number]}")
+    def _write_memory_debug(self, page_number):
+        frame = self.ptable.get(page_number)
+        if frame is None:
+            self._fault_debug(page_number, True)
         else:
-            self.page_faults += 1
-            self.disk_reads += 1
-            if len(self.frames) < self.num_frames:
-                frame_index = len(self.frames)
-                self.frames[frame_index] = page_number
-                self.ptable[page_number] = frame_index
-                if self.debug:
-                    print(f"WRITE FAULT: loaded page {page_number} into free frame {frame_index}")
-            else:
-                sheep = random.choice(list(self.frames.keys()))
-                sheepage = self.frames[sheep]
+            self.dirty[frame] = 1
+            if self.debug:
+                print(_FMT_WRITE_HIT % (page_number, frame))
+
+    def _fault_debug(self, page_number, is_write):
+        # Page fault
+        self.page_faults += 1
+        self.disk_reads += 1
+        if self.used < self.num_frames:
+            # Free frame available
+            frame_index = self.used
+            self.page_of[frame_index] = page_number
+            self.dirty[frame_index] = 1 if is_write else 0
+            self.used += 1
+            self.ptable[page_number] = frame_index
+            if self.debug:
+                if is_write:
+                    print(_FMT_WRITE_LOAD % (page_number, frame_index))
+                else:
+                    print(_FMT_LOAD % (page_number, frame_index))
+        else:
+            #find a frame to become sacrificial object
+            sheep = self._next_victim()
+            sheepage = self.page_of[sheep]
 
+            # the victim only goes back to disk if it was modified
+            if self.dirty[sheep]:
                 self.disk_writes += 1
 
-                self.frames[sheep] = page_number
-                self.ptable.pop(sheepage)
-                self.ptable[page_number] = sheep
+            self.page_of[sheep] = page_number
+            self.dirty[sheep] = 1 if is_write else 0
+            del self.ptable[sheepage]
+            self.ptable[page_number] = sheep
 
-                if self.debug == True:
-                    print(f"WRITE FAULT: replaced page {sheepage} with {page_number} in frame {sheep}")
+            if self.debug:
+                if is_write:
+                    print(_FMT_WRITE_REPLACE % (sheepage, page_number, sheep))
+                else:
+                    print(_FMT_REPLACE % (sheepage, page_number, sheep))
 
     def get_total_disk_reads(self):
         return self.disk_reads
@@ -79,4 +191,4 @@ class RandMMU(MMU):
         return self.disk_writes
 
     def get_total_page_faults(self):
-        return self.page_faults
\ No newline at end of file
+        return self.page_faults